@@ -0,0 +1,59 @@
+"""Benchmark Game.draw() on the Surface and the SDL2 Texture backends.
+
+Uses SDL's software renderer for the texture backend, so it runs on a
+GPU-less Linux box with the dummy/offscreen video driver:
+
+    python bench_render.py [--frames 2000] [--backend surface texture]
+"""
+import os, sys, time, argparse, statistics
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+def run(backend_name, frames, particles):
+    from render import create_backend
+    from game import Game
+    from particles import create_score_particles
+
+    pygame.init()
+    gfx = create_backend(backend_name, (800, 400), accelerated=0)
+    game = Game(gfx)
+    game.invincible = True
+    game.ghost_folder = None
+    game.reset("bench")
+    game.state = "playing"
+    game.score = 10000  # capped difficulty: fastest spawns
+
+    times = []
+    for _ in range(frames):
+        game.update()
+        if particles and len(game.particles) < particles:
+            create_score_particles(game.particles, game.player_rect.centerx, game.player_rect.top, 10)
+        start = time.perf_counter()
+        game.draw()
+        gfx.present()
+        times.append((time.perf_counter() - start) * 1000.0)
+
+    pygame.quit()
+    times.sort()
+    return {
+        "mean": statistics.mean(times),
+        "median": times[len(times) // 2],
+        "p95": times[int(len(times) * 0.95)],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--particles", type=int, default=150, help="keep about this many particles alive")
+    parser.add_argument("--backend", nargs="+", default=["surface", "texture"], choices=("surface", "texture"))
+    args = parser.parse_args()
+
+    print(f"video driver={os.environ['SDL_VIDEODRIVER']} frames={args.frames} particles~{args.particles}")
+    for name in args.backend:
+        r = run(name, args.frames, args.particles)
+        print(f"{name:<8} draw+present mean={r['mean']:.3f} ms median={r['median']:.3f} ms p95={r['p95']:.3f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
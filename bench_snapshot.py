@@ -0,0 +1,69 @@
+"""Benchmark Game.snapshot()/restore() at max-level obstacle density.
+
+Runs headless (SDL dummy drivers):  python bench_snapshot.py [-n 20000]
+"""
+import os, sys, json, random, argparse, timeit
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+def build_max_density_game():
+    from game import Game
+    pygame.init()
+    screen = pygame.display.set_mode((800, 400))
+    game = Game(screen)
+    game.reset("bench")
+    game.state = "playing"
+
+    # jump straight to the capped difficulty
+    game.score = 10000
+    game.calculate_difficulty()
+
+    # fill the screen with obstacles at the tightest spacing the spawner can produce
+    spacing = int(game.obstacle_speed) * (game.spawn_rate + 1)
+    x = game.WIDTH
+    while x > -50:
+        kind = "flying" if random.random() < game.FLYING_PROB else "ground"
+        images = game.obstacle_images_flying if kind == "flying" else game.obstacle_images_ground
+        sprite = random.randrange(len(images))
+        surf = images[sprite]["surf"]
+        bottom = game.GROUND_Y - game.FLYING_HEIGHT if kind == "flying" else game.GROUND_Y
+        game.obstacles.append({"surf": surf, "rect": surf.get_rect(bottomleft=(x, bottom)),
+                               "mask": images[sprite]["mask"], "type": kind, "sprite": sprite})
+        x -= spacing
+
+    # particles at the high-quality cap
+    from particles import create_score_particles
+    create_score_particles(game.particles, 100, 200, game.quality.tier["max_particles"])
+    return game
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20000, help="iterations per measurement")
+    args = parser.parse_args()
+
+    game = build_max_density_game()
+    snap = game.snapshot()
+    snap_rng = game.snapshot(include_rng=True)
+    encoded = json.dumps(snap)
+
+    cases = [
+        ("snapshot()", lambda: game.snapshot()),
+        ("restore()", lambda: game.restore(snap)),
+        ("snapshot(include_rng=True)", lambda: game.snapshot(include_rng=True)),
+        ("restore(with rng)", lambda: game.restore(snap_rng)),
+        ("json.dumps(snapshot)", lambda: json.dumps(snap)),
+        ("json.loads(snapshot)", lambda: json.loads(encoded)),
+    ]
+
+    print(f"obstacles={len(game.obstacles)} particles={len(game.particles)} "
+          f"level={game.game_level} json_bytes={len(encoded)}")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        print(f"{name:<28} {best * 1e6:8.2f} us")
+
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
 # game.py
-import pygame, os, random
-from utils import load_image_safe, scale_to_height, load_sound
-from particles import create_dust_particles, create_score_particles
+import pygame, os, random, json, uuid
+from utils import load_image_safe, scale_to_height, load_sound, convert_for_display
+from particles import Particle, create_dust_particles, create_score_particles
 from player import Player
+from quality import QualityGovernor
+from render import as_backend
+from ghost import GhostRecorder, GhostPlayback, save_ghost, prune_ghosts, top_ghost_files, pose_for, GHOST_FOLDER
 
 class Game:
     def __init__(self, screen, width=800, height=400):
-        self.screen = screen
+        # drawing backend (render.py); a plain Surface gets the software backend
+        self.gfx = as_backend(screen)
         self.WIDTH, self.HEIGHT = width, height
         self.GROUND_Y = 325
 
@@ -35,6 +39,7 @@ class Game:
         self.obstacle_images_ground = self.load_obstacles(os.path.join("assets", "ground_obstacles"), scale=0.48)
         self.obstacle_images_flying = self.load_obstacles(os.path.join("assets", "flying_obstacles"), scale=0.5)
         self.obstacles = []
+        self.invincible = False  # testing/soak runs: collisions never end the run
         self.FLYING_PROB = 0.4
         self.FLYING_HEIGHT = int(self.PLAYER_HEIGHT * 0.5)
 
@@ -49,6 +54,21 @@ class Game:
         # particles container
         self.particles = []
 
+        # adaptive quality (particle caps, decorations, HUD refresh rate)
+        self.quality = QualityGovernor()
+        self._hud = None
+        self._hud_age = 0
+
+        # optional telemetry.Telemetry sink (attached by main)
+        self.telemetry = None
+
+        # ghost runs: record this run, race the best saved ones (None disables)
+        self.ghost_folder = GHOST_FOLDER
+        self.GHOST_COUNT = 3
+        self.ghost_recorder = None
+        self.ghosts = []
+        self.run_id = None
+
         # sounds (utils.load_sound(folder, filename))
         self.jump_sound = load_sound("gameplay_sounds", "jump.mp3")
         self.landing_sound = load_sound("gameplay_sounds", "landing.wav")
@@ -85,7 +105,7 @@ class Game:
     def load_background(self, path):
         if os.path.exists(path):
             try:
-                bg = pygame.image.load(path).convert()
+                bg = convert_for_display(pygame.image.load(path), alpha=False)
                 return pygame.transform.scale(bg, (self.WIDTH, self.HEIGHT))
             except Exception:
                 return None
@@ -129,6 +149,180 @@ class Game:
         self.spawn_rate = 60
 
         self.particles = []
+        self._hud = None
+
+        self.run_id = uuid.uuid4().hex[:12]
+        self.load_ghosts()
+        self.emit("run_start", player=player_name)
+
+    def load_ghosts(self):
+        self.close_ghosts()
+        if not self.ghost_folder:
+            self.ghost_recorder = None
+            return
+        self.ghost_recorder = GhostRecorder()
+        for path in top_ghost_files(self.ghost_folder, self.GHOST_COUNT):
+            try:
+                rect = pygame.Rect(self.player_rect)
+                self.ghosts.append(GhostPlayback(path, rect, len(self.player.run_frames), self.player.RUN_ANIMATION_SPEED))
+            except Exception as e:
+                print(f"Error loading ghost {path}: {e}")
+
+    def close_ghosts(self):
+        for g in self.ghosts:
+            g.close()
+        self.ghosts = []
+
+    def emit(self, event, **fields):
+        if self.telemetry is not None:
+            self.telemetry.emit(event, **fields)
+
+    # ---------- snapshot / restore ----------
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_KEYS = (
+        "state", "player_name", "player_rect", "player_state", "is_jumping", "player_y_change",
+        "slide_timer", "wall_slide_timer", "wall_jump_available", "run_anim", "game_level",
+        "obstacle_speed", "spawn_rate", "obstacle_timer", "obstacles", "score", "score_timer",
+        "last_score_milestone", "particles",
+    )
+
+    def snapshot(self, include_rng=False):
+        """Capture the simulation state as plain (JSON-serializable) data.
+
+        Obstacles and particles are stored by sprite id / values, never as
+        Surfaces, so a snapshot is cheap to take, copy and write to disk.
+        Pass include_rng=True to also capture the random module state, which
+        makes restore + update reproduce the same future (rollback, bots).
+        """
+        r = self.player_rect
+        snap = {
+            "v": self.SNAPSHOT_VERSION,
+            "state": self.state,
+            "player_name": self.player_name,
+            "player_rect": (r.x, r.y, r.w, r.h),
+            "player_state": self.player_state,
+            "is_jumping": self.is_jumping,
+            "player_y_change": self.player_y_change,
+            "slide_timer": self.slide_timer,
+            "wall_slide_timer": self.wall_slide_timer,
+            "wall_jump_available": self.wall_jump_available,
+            "run_anim": (self.player.run_index, self.player.run_timer),
+            "run_id": self.run_id,
+            "ghost_tick": self.ghost_recorder.ticks if self.ghost_recorder is not None else None,
+            "game_level": self.game_level,
+            "obstacle_speed": self.obstacle_speed,
+            "spawn_rate": self.spawn_rate,
+            "obstacle_timer": self.obstacle_timer,
+            "obstacles": [(o["type"], o["sprite"], o["rect"].x, o["rect"].y) for o in self.obstacles],
+            "score": self.score,
+            "score_timer": self.score_timer,
+            "last_score_milestone": self.last_score_milestone,
+            "particles": [(p.x, p.y, p.vel_x, p.vel_y, p.color, p.life, p.max_life, p.size) for p in self.particles],
+        }
+        if include_rng:
+            snap["rng"] = random.getstate()
+        return snap
+
+    def restore(self, snap):
+        """Restore a state captured by snapshot() (also accepts one loaded from JSON)"""
+        if snap.get("v") != self.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {snap.get('v')}")
+
+        self.state = snap["state"]
+        self.player_name = snap["player_name"]
+        self.player_rect = pygame.Rect(snap["player_rect"])
+        self.player_state = snap["player_state"]
+        self.is_jumping = snap["is_jumping"]
+        self.player_y_change = snap["player_y_change"]
+        self.slide_timer = snap["slide_timer"]
+        self.wall_slide_timer = snap["wall_slide_timer"]
+        self.wall_jump_available = snap["wall_jump_available"]
+        self.player.run_index, self.player.run_timer = snap["run_anim"]
+
+        self.game_level = snap["game_level"]
+        self.obstacle_speed = snap["obstacle_speed"]
+        self.spawn_rate = snap["spawn_rate"]
+        self.obstacle_timer = snap["obstacle_timer"]
+
+        obstacles = []
+        for obs_type, sprite, x, y in snap["obstacles"]:
+            images = self.obstacle_images_flying if obs_type == "flying" else self.obstacle_images_ground
+            choice = images[sprite]
+            surf = choice["surf"]
+            obstacles.append({"surf": surf, "rect": surf.get_rect(topleft=(x, y)), "mask": choice["mask"],
+                              "type": obs_type, "sprite": sprite})
+        self.obstacles = obstacles
+
+        self.score = snap["score"]
+        self.score_timer = snap["score_timer"]
+        self.last_score_milestone = snap["last_score_milestone"]
+
+        particles = []
+        for x, y, vel_x, vel_y, color, life, max_life, size in snap["particles"]:
+            p = Particle(x, y, vel_x, vel_y, tuple(color), life, size)
+            p.max_life = max_life
+            particles.append(p)
+        self.particles = particles
+
+        # ghosts and the recorder are still in sync when nothing ran since this
+        # snapshot of the current run (pause/resume); a rollback or a save from
+        # an earlier session can't be recorded or raced consistently
+        recorder = self.ghost_recorder
+        if not (recorder is not None and snap.get("run_id") == self.run_id
+                and snap.get("ghost_tick") == recorder.ticks):
+            self.close_ghosts()
+            self.ghost_recorder = None
+        self.run_id = snap.get("run_id")
+
+        if "rng" in snap:
+            version, internal, gauss = snap["rng"]
+            random.setstate((version, tuple(internal), gauss))
+        self._hud = None
+
+    def save_snapshot(self, path, snap=None, include_rng=False):
+        """Write snap (or a fresh snapshot of the current state) to path as JSON"""
+        if snap is None:
+            snap = self.snapshot(include_rng)
+        try:
+            with open(path, "w") as f:
+                json.dump(snap, f)
+            return True
+        except Exception as e:
+            print(f"Error saving game state: {e}")
+            return False
+
+    def check_snapshot(self, snap):
+        """Raise ValueError if snap can't be restored into this game"""
+        if not isinstance(snap, dict):
+            raise ValueError("snapshot is not an object")
+        if snap.get("v") != self.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {snap.get('v')}")
+        missing = [k for k in self.SNAPSHOT_KEYS if k not in snap]
+        if missing:
+            raise ValueError(f"snapshot is missing {', '.join(missing)}")
+        for obs_type, sprite, x, y in snap["obstacles"]:
+            images = self.obstacle_images_flying if obs_type == "flying" else self.obstacle_images_ground
+            if not 0 <= sprite < len(images):
+                raise ValueError(f"unknown {obs_type} obstacle sprite {sprite}")
+
+    def load_snapshot(self, path):
+        """Read and check a snapshot written by save_snapshot(); returns None if unavailable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                snap = json.load(f)
+            self.check_snapshot(snap)
+            return snap
+        except Exception as e:
+            print(f"Error loading game state: {e}")
+            return None
+
+    def spawn_particles(self, factory, x, y, count):
+        # respect the particle cap of the current quality tier
+        count = min(count, self.quality.tier["max_particles"] - len(self.particles))
+        if count > 0:
+            factory(self.particles, x, y, count)
 
     def calculate_difficulty(self):
         new_level = (self.score // 100) + 1
@@ -137,6 +331,8 @@ class Game:
             # tune these to taste
             self.obstacle_speed = min(5 + (self.game_level - 1) * 1.5, 12)
             self.spawn_rate = max(60 - (self.game_level - 1) * 5, 25)
+            self.emit("level_up", level=self.game_level, score=self.score,
+                      obstacle_speed=self.obstacle_speed, spawn_rate=self.spawn_rate)
 
     # ---------- input handling ----------
     def handle_event(self, event):
@@ -203,7 +399,7 @@ class Game:
         # ground collision
         if self.player_rect.bottom >= self.GROUND_Y:
             if self.is_jumping:
-                create_dust_particles(self.particles, self.player_rect.centerx, self.GROUND_Y, 6)
+                self.spawn_particles(create_dust_particles, self.player_rect.centerx, self.GROUND_Y, 6)
                 if self.landing_sound: self.landing_sound.play()
             self.player_rect.bottom = self.GROUND_Y
             self.is_jumping = False
@@ -218,20 +414,28 @@ class Game:
                 self.wall_jump_available = True
                 self.player_y_change = min(self.player_y_change, 2)
 
+        # ghosts: record this tick, advance the ones being raced
+        if self.ghost_recorder is not None:
+            self.ghost_recorder.record(self.player_rect.x, self.player_rect.y, pose_for(self.player_state, self.is_jumping))
+        for g in self.ghosts:
+            g.step()
+
         # spawn obstacles
         self.obstacle_timer += 1
         if self.obstacle_timer > self.spawn_rate:
             obs_x = self.WIDTH
             if random.random() < self.FLYING_PROB and self.obstacle_images_flying:
-                choice = random.choice(self.obstacle_images_flying)
+                sprite = random.randrange(len(self.obstacle_images_flying))
+                choice = self.obstacle_images_flying[sprite]
                 surf = choice["surf"]; mask = choice["mask"]
                 rect = surf.get_rect(bottomleft=(obs_x, self.GROUND_Y - self.FLYING_HEIGHT))
-                self.obstacles.append({"surf": surf, "rect": rect, "mask": mask, "type": "flying"})
+                self.obstacles.append({"surf": surf, "rect": rect, "mask": mask, "type": "flying", "sprite": sprite})
             elif self.obstacle_images_ground:
-                choice = random.choice(self.obstacle_images_ground)
+                sprite = random.randrange(len(self.obstacle_images_ground))
+                choice = self.obstacle_images_ground[sprite]
                 surf = choice["surf"]; mask = choice["mask"]
                 rect = surf.get_rect(bottomleft=(obs_x, self.GROUND_Y))
-                self.obstacles.append({"surf": surf, "rect": rect, "mask": mask, "type": "ground"})
+                self.obstacles.append({"surf": surf, "rect": rect, "mask": mask, "type": "ground", "sprite": sprite})
             self.obstacle_timer = 0
 
         # move obstacles & check collisions (with hitbox logic)
@@ -254,6 +458,7 @@ class Game:
         )
 
         collided = False
+        hit = None
         for obs in self.obstacles:
             obs_type = obs.get("type", "ground")
 
@@ -277,16 +482,21 @@ class Game:
                     offset_y = collision_box.y - obs["rect"].y
                     if obs["mask"].overlap(hb_mask, (offset_x, offset_y)):
                         collided = True
+                        hit = obs
                         break
             else:
                 if obs["rect"].colliderect(collision_box):
                     collided = True
+                    hit = obs
                     break
 
-        if collided:
+        if collided and not self.invincible:
             # game over - save score to database
             if self.game_over_sound: 
                 self.game_over_sound.play()
+
+            self.emit("collision", obstacle_type=hit.get("type", "ground"), sprite=hit.get("sprite"),
+                      level=self.game_level, score=self.score, player_state=self.player_state)
             
             # Save score to database (with better error handling)
             try:
@@ -300,6 +510,14 @@ class Game:
                 print("Database module not available - score not saved")
             except Exception as e:
                 print(f"Error saving score: {e}")
+
+            # save the trajectory next to the score so the run can be raced as a ghost,
+            # keeping only the runs that can still be raced
+            self.close_ghosts()
+            if self.ghost_recorder is not None:
+                save_ghost(self.ghost_recorder, self.player_name, self.score, self.ghost_folder)
+                prune_ghosts(self.ghost_folder, self.GHOST_COUNT)
+                self.ghost_recorder = None
             
             self.last_score = self.score
             self.last_player_name = self.player_name
@@ -314,50 +532,67 @@ class Game:
             self.score += 1
             self.score_timer = 0
             if self.score % 10 == 0 and self.score > self.last_score_milestone:
-                create_score_particles(self.particles, self.player_rect.centerx, self.player_rect.top, 10)
+                self.spawn_particles(create_score_particles, self.player_rect.centerx, self.player_rect.top, 10)
                 if self.score_sound: self.score_sound.play()
                 self.last_score_milestone = self.score
 
         # update particles (remove dead)
         self.particles = [p for p in self.particles if p.update()]
+        del self.particles[self.quality.tier["max_particles"]:]
 
     # ---------- drawing ----------
+    def render_hud(self):
+        hud = [
+            (self.font.render(f"Score: {self.score}", True, (255,215,0)), (10,10)),
+            (self.small_font.render(f"Level: {self.game_level}", True, (255,215,0)), (10,45)),
+        ]
+        if self.quality.tier["decorations"]:
+            # Show player name
+            hud.append((self.small_font.render(f"Player: {self.player_name}", True, (255,255,255)), (10,70)))
+        return hud
+
     def draw(self):
+        tier = self.quality.tier
+
         # background
-        if self.background:
-            self.screen.blit(self.background, (0,0))
+        if self.background and tier["decorations"]:
+            self.gfx.blit(self.background, (0,0))
         else:
-            self.screen.fill((135,206,235))
-            pygame.draw.rect(self.screen, (80,180,60), pygame.Rect(0, self.GROUND_Y, self.WIDTH, self.HEIGHT - self.GROUND_Y))
+            self.gfx.fill((135,206,235))
+            self.gfx.draw_rect((80,180,60), pygame.Rect(0, self.GROUND_Y, self.WIDTH, self.HEIGHT - self.GROUND_Y))
 
         if self.state == "menu":
             title = self.font.render("Super Maro", True, (0,0,0))
             prompt = self.font.render("Press SPACE to Start", True, (0,0,0))
-            self.screen.blit(title, (self.WIDTH//2 - title.get_width()//2, self.HEIGHT//3))
-            self.screen.blit(prompt, (self.WIDTH//2 - prompt.get_width()//2, self.HEIGHT//2))
+            self.gfx.blit(title, (self.WIDTH//2 - title.get_width()//2, self.HEIGHT//3))
+            self.gfx.blit(prompt, (self.WIDTH//2 - prompt.get_width()//2, self.HEIGHT//2))
             if self.last_score > 0:
                 last_text = self.font.render(f"{self.last_player_name} - {self.last_score}", True, (255,215,0))
-                self.screen.blit(last_text, (self.WIDTH//2 - last_text.get_width()//2, self.HEIGHT//2 + 40))
+                self.gfx.blit(last_text, (self.WIDTH//2 - last_text.get_width()//2, self.HEIGHT//2 + 40))
 
         elif self.state == "playing":
+            # ghosts (cached translucent copies of the player frames)
+            for g in self.ghosts:
+                if not g.finished:
+                    self.gfx.blit(self.player.get_ghost_sprite(g.pose, g.run_index), g.rect)
+
             # player sprite
             sprite = self.player.get_current_sprite(self.player_state, self.is_jumping)
-            self.screen.blit(sprite, self.player_rect)
+            self.gfx.blit(sprite, self.player_rect)
 
             # obstacles
             for obs in self.obstacles:
-                self.screen.blit(obs["surf"], obs["rect"])
+                self.gfx.blit(obs["surf"], obs["rect"])
 
             # particles
-            for p in self.particles:
-                p.draw(self.screen)
-
-            # HUD
-            score_text = self.font.render(f"Score: {self.score}", True, (255,215,0))
-            self.screen.blit(score_text, (10,10))
-            level_text = self.small_font.render(f"Level: {self.game_level}", True, (255,215,0))
-            self.screen.blit(level_text, (10,45))
-            
-            # Show player name
-            name_text = self.small_font.render(f"Player: {self.player_name}", True, (255,255,255))
-            self.screen.blit(name_text, (10,70))
\ No newline at end of file
+            if tier["decorations"]:
+                for p in self.particles:
+                    p.draw(self.gfx)
+
+            # HUD (re-rendered every hud_interval frames)
+            self._hud_age += 1
+            if self._hud is None or self._hud_age >= tier["hud_interval"]:
+                self._hud = self.render_hud()
+                self._hud_age = 0
+            for surf, pos in self._hud:
+                self.gfx.blit(surf, pos)
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Ghost runs: record the player's trajectory and play it back as a translucent ghost.
+
+File layout (all integers are LEB128 varints, signed ones zigzag encoded):
+
+    b"SMGH" version  len(name) name  score  ticks   header
+    (count << 2 | pose)  ddx  ddy                   repeated records
+
+Each tick stores the second difference of the player_rect top-left, so
+running along the ground and whole gravity arcs (constant acceleration) are
+just a few run-length records. A multi-minute run is a few kilobytes.
+Playback reads the file in small chunks while the ghost advances.
+"""
+import os, re, time
+
+MAGIC = b"SMGH"
+VERSION = 1
+GHOST_FOLDER = "ghosts"
+CHUNK_SIZE = 4096
+
+# poses map onto the Player sprites (see Player.get_current_sprite)
+POSE_RUN, POSE_JUMP, POSE_SLIDE, POSE_IDLE = range(4)
+
+def pose_for(state, is_jumping):
+    if state == "sliding":
+        return POSE_SLIDE
+    if is_jumping or state == "wall_sliding":
+        return POSE_JUMP
+    if state == "running":
+        return POSE_RUN
+    return POSE_IDLE
+
+def write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+def unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+class GhostRecorder:
+    """Encodes one run tick by tick into an in-memory bytearray"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ticks = 0
+        self._x = self._y = self._dx = self._dy = 0
+        self._run = None   # (pose, ddx, ddy) of the pending record
+        self._count = 0
+
+    def record(self, x, y, pose):
+        dx, dy = x - self._x, y - self._y
+        key = (pose, dx - self._dx, dy - self._dy)
+        self._x, self._y, self._dx, self._dy = x, y, dx, dy
+        self.ticks += 1
+        if key == self._run:
+            self._count += 1
+        else:
+            self._flush()
+            self._run, self._count = key, 1
+
+    def _flush(self):
+        if self._count:
+            pose, ddx, ddy = self._run
+            write_varint(self.data, (self._count << 2) | pose)
+            write_varint(self.data, zigzag(ddx))
+            write_varint(self.data, zigzag(ddy))
+            self._count = 0
+
+    def encode(self, player_name, score):
+        self._flush()
+        name = player_name.encode("utf-8")
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        write_varint(out, len(name))
+        out += name
+        write_varint(out, score)
+        write_varint(out, self.ticks)
+        return bytes(out + self.data)
+
+def ghost_filename(player_name, score):
+    # score first (zero padded) so a reverse name sort lists the best runs first
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", player_name)[:12] or "Player"
+    return f"{score:08d}-{safe}-{int(time.time() * 1000)}.ghost"
+
+def save_ghost(recorder, player_name, score, folder=GHOST_FOLDER):
+    """Write the recorded run next to the saved score; returns the path or None"""
+    try:
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, ghost_filename(player_name, score))
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(recorder.encode(player_name, score))
+        os.replace(tmp, path)
+        return path
+    except Exception as e:
+        print(f"Error saving ghost: {e}")
+        return None
+
+def top_ghost_files(folder=GHOST_FOLDER, count=3):
+    """Ghost files of the best runs, highest score first"""
+    if not os.path.isdir(folder):
+        return []
+    files = sorted((fn for fn in os.listdir(folder) if fn.endswith(".ghost")), reverse=True)
+    return [os.path.join(folder, fn) for fn in files[:count]]
+
+def prune_ghosts(folder=GHOST_FOLDER, keep=3):
+    """Delete all but the keep best ghost files"""
+    if not os.path.isdir(folder):
+        return
+    files = sorted((fn for fn in os.listdir(folder) if fn.endswith(".ghost")), reverse=True)
+    for fn in files[keep:]:
+        try:
+            os.remove(os.path.join(folder, fn))
+        except OSError as e:
+            print(f"Error removing ghost {fn}: {e}")
+
+class GhostPlayback:
+    """Streams a ghost file and advances one tick per step().
+
+    State is updated in place (rect, pose, run_index) so playing several
+    ghosts does not allocate per frame; the file is read CHUNK_SIZE bytes at
+    a time as records are consumed.
+    """
+
+    def __init__(self, path, rect, run_frames=1, run_animation_speed=8):
+        self.path = path
+        self.file = open(path, "rb")
+        self._buf = b""
+        self._pos = 0
+        self._eof = False
+
+        if self._read_bytes(4) != MAGIC or self._read_byte() != VERSION:
+            self.close()
+            raise ValueError(f"Not a ghost file: {path}")
+        self.player_name = self._read_bytes(self._read_varint()).decode("utf-8", "replace")
+        self.score = self._read_varint()
+        self.ticks = self._read_varint()
+
+        self.rect = rect          # caller supplies a Rect; only its position is used
+        self.pose = POSE_RUN
+        self.run_frames = max(1, run_frames)
+        self.run_animation_speed = run_animation_speed
+        self.run_index = 0
+        self._run_timer = 0
+        self.finished = False
+
+        self._x = self._y = self._dx = self._dy = 0
+        self._remaining = 0
+        self._ddx = self._ddy = 0
+
+    # ---------- chunked reading ----------
+    def _fill(self):
+        if self._eof:
+            return False
+        chunk = self.file.read(CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _read_byte(self):
+        if self._pos >= len(self._buf) and not self._fill():
+            raise EOFError
+        b = self._buf[self._pos]
+        self._pos += 1
+        return b
+
+    def _read_bytes(self, n):
+        while len(self._buf) - self._pos < n:
+            if not self._fill():
+                raise EOFError
+        data = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return data
+
+    def _read_varint(self):
+        shift = result = 0
+        while True:
+            b = self._read_byte()
+            result |= (b & 0x7F) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    # ---------- playback ----------
+    def step(self):
+        if self.finished:
+            return False
+        if self._remaining == 0:
+            try:
+                head = self._read_varint()
+                self._ddx = unzigzag(self._read_varint())
+                self._ddy = unzigzag(self._read_varint())
+            except EOFError:
+                self.finished = True
+                self.close()
+                return False
+            self._remaining = head >> 2
+            self.pose = head & 3
+        self._remaining -= 1
+
+        self._dx += self._ddx
+        self._dy += self._ddy
+        self._x += self._dx
+        self._y += self._dy
+        self.rect.x = self._x
+        self.rect.y = self._y
+
+        if self.pose == POSE_RUN:
+            self._run_timer += 1
+            if self._run_timer >= self.run_animation_speed:
+                self._run_timer = 0
+                self.run_index = (self.run_index + 1) % self.run_frames
+        return True
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
@@ -1,21 +1,41 @@
 import pygame, sys
 from game import Game
-import os
+from utils import convert_for_display
+from telemetry import Telemetry
+from render import create_backend
+import os, time, argparse
+
+parser = argparse.ArgumentParser(description="Super Maro")
+parser.add_argument("--renderer", choices=("surface", "texture"), default="surface",
+                    help="software Surface blits (default) or SDL2 Renderer/Texture drawing")
+parser.add_argument("--software", action="store_true", help="force SDL's software renderer for --renderer texture")
+args = parser.parse_args()
 
 pygame.init()
 pygame.mixer.init()
 
 WIDTH, HEIGHT = 800, 400
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Super Maro")
+gfx = create_backend(args.renderer, (WIDTH, HEIGHT), "Super Maro", accelerated=0 if args.software else -1)
 clock = pygame.time.Clock()
 
-game = Game(screen, WIDTH, HEIGHT)
+game = Game(gfx, WIDTH, HEIGHT)
+
+# gameplay telemetry (written in the background to telemetry/*.jsonl.gz)
+telemetry = Telemetry().start()
+game.telemetry = telemetry
+game.quality.add_listener(lambda c: telemetry.emit("quality_change", **c))
 
 # Menu states: "menu", "playing", "dashboard"
 menu_state = "menu"
 player_name_input = ""   # input buffer for name entry
 
+# Paused/saved run that can be resumed from the menu (see Game.snapshot)
+SAVE_FILE = "savegame.json"
+resume_snapshot = game.load_snapshot(SAVE_FILE)
+if resume_snapshot is None and os.path.exists(SAVE_FILE):
+    # unreadable or incompatible save
+    os.remove(SAVE_FILE)
+
 # Fonts for UI
 font = pygame.font.SysFont(None, 40)
 small_font = pygame.font.SysFont(None, 28)
@@ -35,7 +55,7 @@ def load_menu_background():
     for path in background_paths:
         if os.path.exists(path):
             try:
-                bg = pygame.image.load(path).convert()
+                bg = convert_for_display(pygame.image.load(path), alpha=False)
                 return pygame.transform.scale(bg, (WIDTH, HEIGHT))
             except Exception as e:
                 print(f"Error loading menu background {path}: {e}")
@@ -56,60 +76,67 @@ def draw_gradient_background():
         b = int(60 + (235 - 60) * ratio)
         
         color = (r, g, b)
-        pygame.draw.line(game.screen, color, (0, y), (WIDTH, y))
+        game.gfx.draw_line(color, (0, y), (WIDTH, y))
 
 def draw_menu():
     """Draw the main menu with name input and navigation options"""
     # Try to load and display menu background
     menu_background = load_menu_background()
     if menu_background:
-        game.screen.blit(menu_background, (0, 0))
-    else:
+        game.gfx.blit(menu_background, (0, 0))
+    elif game.quality.tier["decorations"]:
         # Fallback gradient background if no image found
         draw_gradient_background()
+    else:
+        game.gfx.fill((20, 30, 60))
     
     # Title with gold color and shadow effect
     title_shadow = title_font.render("Super Maro", True, (0, 0, 0))  # Black shadow
     title = title_font.render("Super Maro", True, (255, 215, 0))  # Gold color
     # Draw title with shadow effect
-    game.screen.blit(title_shadow, (WIDTH//2 - title.get_width()//2 + 3, 53))  # Shadow offset
-    game.screen.blit(title, (WIDTH//2 - title.get_width()//2, 50))
+    if game.quality.tier["decorations"]:
+        game.gfx.blit(title_shadow, (WIDTH//2 - title.get_width()//2 + 3, 53))  # Shadow offset
+    game.gfx.blit(title, (WIDTH//2 - title.get_width()//2, 50))
     
     # Name input section
     name_label = font.render("Enter your name:", True, (50, 50, 50))
-    game.screen.blit(name_label, (WIDTH//2 - name_label.get_width()//2, 150))
+    game.gfx.blit(name_label, (WIDTH//2 - name_label.get_width()//2, 150))
     
     # Name input box
     input_box = pygame.Rect(WIDTH//2 - 150, 180, 300, 40)
-    pygame.draw.rect(game.screen, (255, 255, 255), input_box)
-    pygame.draw.rect(game.screen, (0, 0, 0), input_box, 2)
+    game.gfx.draw_rect((255, 255, 255), input_box)
+    game.gfx.draw_rect((0, 0, 0), input_box, 2)
     
     # Display current input
     name_text = font.render(player_name_input + "_", True, (0, 0, 0))
-    game.screen.blit(name_text, (input_box.x + 5, input_box.y + 8))
+    game.gfx.blit(name_text, (input_box.x + 5, input_box.y + 8))
     
     # Instructions
     start_text = small_font.render("Press ENTER to Start Game", True, (0, 100, 0))
-    game.screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, 250))
+    game.gfx.blit(start_text, (WIDTH//2 - start_text.get_width()//2, 250))
     
     dashboard_text = small_font.render("Press D for Dashboard/Leaderboard", True, (0, 0, 150))
-    game.screen.blit(dashboard_text, (WIDTH//2 - dashboard_text.get_width()//2, 280))
+    game.gfx.blit(dashboard_text, (WIDTH//2 - dashboard_text.get_width()//2, 280))
     
     controls_text = small_font.render("Controls: SPACE=Jump, DOWN=Slide", True, (100, 100, 100))
-    game.screen.blit(controls_text, (WIDTH//2 - controls_text.get_width()//2, 320))
+    game.gfx.blit(controls_text, (WIDTH//2 - controls_text.get_width()//2, 320))
+
+    if resume_snapshot:
+        resume_text = small_font.render(f"Press TAB to Resume ({resume_snapshot['player_name']} - {resume_snapshot['score']})", True, (0, 100, 0))
+        game.gfx.blit(resume_text, (WIDTH//2 - resume_text.get_width()//2, 225))
     
     # Show last score if exists
     if game.last_score > 0:
         last_text = small_font.render(f"Last: {game.last_player_name} - {game.last_score}", True, (255, 215, 0))
-        game.screen.blit(last_text, (WIDTH//2 - last_text.get_width()//2, 350))
+        game.gfx.blit(last_text, (WIDTH//2 - last_text.get_width()//2, 350))
 
 def draw_dashboard():
     """Draw the dashboard/leaderboard screen"""
-    game.screen.fill((20, 30, 60))  # Dark blue background
+    game.gfx.fill((20, 30, 60))  # Dark blue background
     
     # Title
     title = title_font.render("🏆 Leaderboard 🏆", True, (255, 215, 0))
-    game.screen.blit(title, (WIDTH//2 - title.get_width()//2, 30))
+    game.gfx.blit(title, (WIDTH//2 - title.get_width()//2, 30))
     
     try:
         # Import here to avoid issues if database.py has problems
@@ -121,11 +148,11 @@ def draw_dashboard():
         if top_scores:
             y_pos = 100
             rank_text = small_font.render("Rank  Player          Score", True, (200, 200, 200))
-            game.screen.blit(rank_text, (50, y_pos))
+            game.gfx.blit(rank_text, (50, y_pos))
             y_pos += 30
             
             # Draw separator line
-            pygame.draw.line(game.screen, (100, 100, 100), (50, y_pos), (WIDTH-50, y_pos), 2)
+            game.gfx.draw_rect((100, 100, 100), pygame.Rect(50, y_pos - 1, WIDTH - 100, 2))
             y_pos += 20
             
             for i, record in enumerate(top_scores, 1):
@@ -147,31 +174,38 @@ def draw_dashboard():
                 score_str = f"{score:>6d}"
                 
                 line_text = small_font.render(f"{rank_str} {player_str} {score_str}", True, color)
-                game.screen.blit(line_text, (60, y_pos))
+                game.gfx.blit(line_text, (60, y_pos))
                 y_pos += 25
                 
                 if y_pos > 320:  # Don't overflow screen
                     break
         else:
             no_scores_text = font.render("No scores yet! Be the first to play!", True, (255, 255, 255))
-            game.screen.blit(no_scores_text, (WIDTH//2 - no_scores_text.get_width()//2, 150))
+            game.gfx.blit(no_scores_text, (WIDTH//2 - no_scores_text.get_width()//2, 150))
             
     except ImportError:
         error_text = font.render("Database not available", True, (255, 100, 100))
-        game.screen.blit(error_text, (WIDTH//2 - error_text.get_width()//2, 150))
+        game.gfx.blit(error_text, (WIDTH//2 - error_text.get_width()//2, 150))
     except Exception as e:
         error_text = small_font.render(f"Database error: {str(e)[:50]}", True, (255, 100, 100))
-        game.screen.blit(error_text, (WIDTH//2 - error_text.get_width()//2, 150))
+        game.gfx.blit(error_text, (WIDTH//2 - error_text.get_width()//2, 150))
     
     # Instructions
     back_text = small_font.render("Press ESC or B to go Back to Menu", True, (150, 150, 255))
-    game.screen.blit(back_text, (WIDTH//2 - back_text.get_width()//2, HEIGHT - 50))
+    game.gfx.blit(back_text, (WIDTH//2 - back_text.get_width()//2, HEIGHT - 50))
 
 running = True
 while running:
+    frame_start = time.perf_counter()
+
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+            # save-on-quit: keep the unfinished run so it can be resumed next time
+            if menu_state == "playing":
+                resume_snapshot = game.snapshot()
+            if resume_snapshot:
+                game.save_snapshot(SAVE_FILE, resume_snapshot)
 
         if menu_state == "menu":
             if event.type == pygame.KEYDOWN:
@@ -183,6 +217,17 @@ while running:
                     game.reset(final_name)
                     game.state = "playing"
                     menu_state = "playing"
+                elif event.key == pygame.K_TAB and resume_snapshot:
+                    # Resume the paused/saved run (a save that fails to restore is dropped)
+                    try:
+                        game.restore(resume_snapshot)
+                        game.state = "playing"
+                        menu_state = "playing"
+                    except Exception as e:
+                        print(f"Error resuming game: {e}")
+                    resume_snapshot = None
+                    if os.path.exists(SAVE_FILE):
+                        os.remove(SAVE_FILE)
                 elif event.key == pygame.K_d:
                     # Go to dashboard
                     menu_state = "dashboard"
@@ -202,6 +247,7 @@ while running:
         elif menu_state == "playing":
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 # Allow ESC to pause/return to menu during game
+                resume_snapshot = game.snapshot()
                 menu_state = "menu"
                 game.state = "menu"
             else:
@@ -223,8 +269,14 @@ while running:
     elif menu_state == "playing":
         game.draw()
 
-    pygame.display.flip()
+    gfx.present()
+    # feed the quality governor with the work time only (not the tick sleep)
+    frame_ms = (time.perf_counter() - frame_start) * 1000.0
+    game.quality.record(frame_ms)
+    if menu_state == "playing":
+        telemetry.frame(frame_ms, level=game.game_level, tier=game.quality.tier["name"])
     clock.tick(60)
 
+telemetry.close()
 pygame.quit()
 sys.exit()
\ No newline at end of file
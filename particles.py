@@ -1,4 +1,4 @@
-import pygame, random
+import random
 
 class Particle:
     def __init__(self, x, y, vel_x, vel_y, color, life, size=2):
@@ -16,12 +16,10 @@ class Particle:
         self.life -= 1
         return self.life > 0
     
-    def draw(self, screen):
+    def draw(self, gfx):
         alpha = int(255 * (self.life / self.max_life))
         if alpha > 0:
-            surf = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*self.color, alpha), (self.size, self.size), self.size)
-            screen.blit(surf, (int(self.x-self.size), int(self.y-self.size)))
+            gfx.draw_particle(self.x, self.y, self.size, self.color, alpha)
 
 def create_dust_particles(particles, x, y, count=5):
     for _ in range(count):
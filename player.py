@@ -1,5 +1,6 @@
 import os, pygame
 from utils import load_image_safe, scale_to_height
+from ghost import POSE_RUN, POSE_JUMP, POSE_SLIDE
 
 class Player:
     def __init__(self, sprite_dir, height):
@@ -12,6 +13,8 @@ class Player:
         self.run_index = 0
         self.run_timer = 0
         self.RUN_ANIMATION_SPEED = 8
+        self.GHOST_ALPHA = 90
+        self._ghost_cache = {}
         self.load_sprites()
 
     def load_sprites(self):
@@ -45,3 +48,22 @@ class Player:
             return self.run_frames[self.run_index]
         else:
             return self.idle
+
+    def get_ghost_sprite(self, pose, run_index=0):
+        # translucent copy of a sprite frame, built once per frame and reused;
+        # only running has more than one frame
+        key = (pose, run_index % len(self.run_frames) if pose == POSE_RUN else 0)
+        surf = self._ghost_cache.get(key)
+        if surf is None:
+            if pose == POSE_RUN:
+                base = self.run_frames[key[1]]
+            elif pose == POSE_JUMP:
+                base = self.jump
+            elif pose == POSE_SLIDE:
+                base = self.slide
+            else:
+                base = self.idle
+            surf = base.copy()
+            surf.set_alpha(self.GHOST_ALPHA)
+            self._ghost_cache[key] = surf
+        return surf
@@ -0,0 +1,103 @@
+import time
+from collections import deque
+
+# Quality tiers, best first. The governor walks down this list when frames run
+# over budget and back up once there is headroom again.
+#   max_particles - hard cap on live particles
+#   decorations   - draw decorative layers (background image, particles,
+#                   title shadow, player name line)
+#   hud_interval  - re-render HUD text every N frames
+QUALITY_TIERS = [
+    {"name": "high",    "max_particles": 200, "decorations": True,  "hud_interval": 1},
+    {"name": "medium",  "max_particles": 60,  "decorations": True,  "hud_interval": 3},
+    {"name": "low",     "max_particles": 20,  "decorations": True,  "hud_interval": 6},
+    {"name": "minimal", "max_particles": 0,   "decorations": False, "hud_interval": 15},
+]
+
+class QualityGovernor:
+    """Steps through QUALITY_TIERS based on a rolling frame-time average.
+
+    Hysteresis: a downgrade needs the average over the full window to exceed
+    the budget, an upgrade needs it to stay below upgrade_ratio * budget for
+    at least upgrade_hold frames since the last change. The window is cleared
+    on every change so each decision is made on frames from the new tier only.
+    """
+
+    def __init__(self, budget_ms=16.6, window=60, upgrade_ratio=0.6, upgrade_hold=300,
+                 tiers=QUALITY_TIERS, tier=0, enabled=True):
+        self.budget_ms = budget_ms
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_hold = upgrade_hold
+        self.tiers = tiers
+        self.level = tier
+        self.enabled = enabled
+
+        self.samples = deque(maxlen=window)
+        self._sample_sum = 0.0
+        self.frame = 0
+        self.frames_since_change = 0
+
+        # telemetry: recent tier changes and callbacks notified on each change
+        self.changes = deque(maxlen=100)
+        self.listeners = []
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    def average_ms(self):
+        if not self.samples:
+            return 0.0
+        return self._sample_sum / len(self.samples)
+
+    def add_listener(self, fn):
+        """fn(change_dict) is called on every tier change"""
+        self.listeners.append(fn)
+
+    def record(self, frame_ms):
+        """Feed the time spent on one frame (milliseconds, excluding vsync/sleep)"""
+        self.frame += 1
+        self.frames_since_change += 1
+
+        if len(self.samples) == self.samples.maxlen:
+            self._sample_sum -= self.samples[0]
+        self.samples.append(frame_ms)
+        self._sample_sum += frame_ms
+
+        if not self.enabled or len(self.samples) < self.samples.maxlen:
+            return
+
+        avg = self.average_ms()
+        if avg > self.budget_ms and self.level < len(self.tiers) - 1:
+            self._set_level(self.level + 1, avg)
+        elif (avg < self.budget_ms * self.upgrade_ratio and self.level > 0
+              and self.frames_since_change >= self.upgrade_hold):
+            self._set_level(self.level - 1, avg)
+
+    def _set_level(self, level, avg):
+        change = {
+            "frame": self.frame,
+            "time": time.time(),
+            "from": self.tiers[self.level]["name"],
+            "to": self.tiers[level]["name"],
+            "avg_ms": round(avg, 3),
+        }
+        self.level = level
+        self.frames_since_change = 0
+        self.samples.clear()
+        self._sample_sum = 0.0
+        self.changes.append(change)
+        for fn in self.listeners:
+            try:
+                fn(change)
+            except Exception as e:
+                print("Quality listener error:", e)
+
+    def stats(self):
+        return {
+            "tier": self.tier["name"],
+            "avg_ms": round(self.average_ms(), 3),
+            "budget_ms": self.budget_ms,
+            "frames": self.frame,
+            "changes": len(self.changes),
+        }
@@ -0,0 +1,125 @@
+"""Drawing backends.
+
+Game, the menu screens and particles only talk to this small interface, so
+the classic software blitting path and the SDL2 Renderer/Texture path are
+interchangeable:
+
+    size                          (width, height)
+    fill(color)
+    blit(surf, dest)              dest is an (x, y) point or a Rect
+    draw_rect(color, rect, width=0)
+    draw_line(color, start, end)
+    draw_particle(x, y, size, color, alpha)
+    present()
+"""
+import weakref
+import pygame
+
+class SurfaceBackend:
+    """Software blits onto a Surface (normally the display surface)"""
+
+    name = "surface"
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.size = surface.get_size()
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def blit(self, surf, dest):
+        self.surface.blit(surf, dest)
+
+    def draw_rect(self, color, rect, width=0):
+        pygame.draw.rect(self.surface, color, rect, width)
+
+    def draw_line(self, color, start, end):
+        pygame.draw.line(self.surface, color, start, end)
+
+    def draw_particle(self, x, y, size, color, alpha):
+        surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (*color, alpha), (size, size), size)
+        self.surface.blit(surf, (int(x-size), int(y-size)))
+
+    def present(self):
+        pygame.display.flip()
+
+class TextureBackend:
+    """pygame._sdl2 Renderer/Texture drawing.
+
+    Surfaces are uploaded to a Texture the first time they are drawn and the
+    texture is reused for as long as the Surface object is alive, so static
+    sprites are uploaded once. Surface alpha (set_alpha) is carried over to the
+    texture. Particles use one white circle texture per radius, tinted and
+    faded through the texture color/alpha modulation.
+
+    accelerated=0 selects SDL's software renderer (works without a GPU).
+    """
+
+    name = "texture"
+
+    def __init__(self, size, title="Super Maro", accelerated=-1, vsync=False):
+        from pygame._sdl2.video import Window, Renderer, Texture
+        self._Texture = Texture
+        self.size = size
+        self.window = Window(title, size)
+        self.renderer = Renderer(self.window, accelerated=accelerated, vsync=vsync)
+        self._textures = weakref.WeakKeyDictionary()
+        self._circles = {}
+
+    def texture(self, surf):
+        tex = self._textures.get(surf)
+        if tex is None:
+            tex = self._Texture.from_surface(self.renderer, surf)
+            self._textures[surf] = tex
+        return tex
+
+    def fill(self, color):
+        self.renderer.draw_color = (*color[:3], 255)
+        self.renderer.clear()
+
+    def blit(self, surf, dest):
+        # like Surface.blit, a Rect destination only gives the position
+        if isinstance(dest, pygame.Rect):
+            dest = dest.topleft
+        self.texture(surf).draw(dstrect=dest)
+
+    def draw_rect(self, color, rect, width=0):
+        self.renderer.draw_color = (*color[:3], 255)
+        if width:
+            rect = pygame.Rect(rect)
+            for i in range(width):
+                self.renderer.draw_rect(rect.inflate(-2*i, -2*i))
+        else:
+            self.renderer.fill_rect(rect)
+
+    def draw_line(self, color, start, end):
+        self.renderer.draw_color = (*color[:3], 255)
+        self.renderer.draw_line(start, end)
+
+    def draw_particle(self, x, y, size, color, alpha):
+        tex = self._circles.get(size)
+        if tex is None:
+            surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (255, 255, 255), (size, size), size)
+            tex = self._circles[size] = self._Texture.from_surface(self.renderer, surf)
+        tex.color = color
+        tex.alpha = alpha
+        tex.draw(dstrect=(int(x-size), int(y-size)))
+
+    def present(self):
+        self.renderer.present()
+
+def as_backend(target):
+    """Wrap a plain Surface in a SurfaceBackend; backends are returned unchanged"""
+    if isinstance(target, pygame.Surface):
+        return SurfaceBackend(target)
+    return target
+
+def create_backend(name, size, title="Super Maro", accelerated=-1):
+    """Open the game window for the named backend ("surface" or "texture")"""
+    if name == "texture":
+        return TextureBackend(size, title, accelerated=accelerated)
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(title)
+    return SurfaceBackend(screen)
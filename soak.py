@@ -0,0 +1,198 @@
+"""Long-session soak test: drive Game headlessly and fail on sustained growth.
+
+    python soak.py --ticks 2000000                    # invincible bot (default)
+    python soak.py --ticks 200000 --no-invincible     # collisions end the run
+
+A bot jumps and slides in both modes. From level 8 obstacles spawn every 26
+ticks while a jump or slide takes 30, so no player (or bot) survives long
+there; only invincible runs reach the unbounded scores of a long session.
+
+Every --sample-every ticks it records RSS, traced Python memory, the live
+object count and the mean update (+draw) cost per 1000 ticks. After the run
+the post-warmup samples are split in thirds and the median of the last third
+is compared with the first; growth beyond the thresholds fails the run
+(exit code 1), which keeps one-off spikes from tripping it.
+"""
+import os, sys, gc, time, argparse, statistics, tracemalloc
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+def rss_mb():
+    # current RSS on Linux, peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+JUMP_EVENT = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+SLIDE_EVENT = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN)
+
+# Game.handle_event/update physics: jump starts at -16 px/tick with +1 gravity,
+# a slide covers the updates before slide_timer (30) runs out
+JUMP_HEIGHTS = []
+_vy, _h = -16, 0
+while True:
+    _vy += 1
+    _h -= _vy
+    if _h <= 0:
+        break
+    JUMP_HEIGHTS.append(_h)   # height of the feet after update n+1
+SLIDE_TICKS = 29
+
+def bot_step(game):
+    """Jump over the next ground obstacle, slide under the next flying one.
+
+    The action is started as late as still covers the whole time the obstacle
+    spends over the hitbox, so the bot is back on the ground as early as
+    possible for the next obstacle (spawns can be closer than one jump). A
+    ground obstacle that stays under the hitbox longer than the jump's clear
+    window gets the crossing centred on that window instead.
+    """
+    if game.is_jumping or game.player_state == "sliding":
+        return
+    half = max(10, int(game.player_rect.width * 0.5)) // 2
+    left, right = game.player_rect.centerx - half, game.player_rect.centerx + half
+    ahead = [o for o in game.obstacles if o["rect"].right > left]
+    if not ahead:
+        return
+    obs = min(ahead, key=lambda o: o["rect"].x)
+    speed = max(1, int(game.obstacle_speed))
+    # update in which the obstacle first / last overlaps the hitbox columns
+    first = (obs["rect"].left - right) // speed + 1
+    last = (obs["rect"].right - left) // speed + 1
+
+    if obs["type"] == "flying":
+        # any overlap outside the slide hits the tall hitbox
+        if last > SLIDE_TICKS - 1:
+            return
+        game.handle_event(SLIDE_EVENT)
+    else:
+        # updates in which the feet are above the obstacle
+        clear = [n + 1 for n, h in enumerate(JUMP_HEIGHTS) if h > obs["rect"].height]
+        if not clear:
+            return
+        if last - first < clear[-1] - clear[0]:
+            # the crossing fits: the first tick with last < clear[-1] is the
+            # latest start, and first >= clear[0] still holds then
+            if last >= clear[-1]:
+                return
+        elif first + last > clear[0] + clear[-1]:
+            # longer than the clear window: centre the crossing on it
+            return
+        game.handle_event(JUMP_EVENT)
+
+def growth(values):
+    """(first third median, last third median) of a series"""
+    third = max(1, len(values) // 3)
+    return statistics.median(values[:third]), statistics.median(values[-third:])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=1000000)
+    parser.add_argument("--sample-every", type=int, default=20000, help="ticks between samples")
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of samples ignored for growth checks")
+    parser.add_argument("--invincible", action=argparse.BooleanOptionalAction, default=True,
+                        help="collisions never end the run (default); --no-invincible restarts on death")
+    parser.add_argument("--draw", action=argparse.BooleanOptionalAction, default=True, help="also call Game.draw() every tick")
+    parser.add_argument("--tracemalloc", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--top", type=int, default=10, help="top allocators to report at the end")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=16.0)
+    parser.add_argument("--max-traced-growth-mb", type=float, default=4.0)
+    parser.add_argument("--max-object-growth", type=int, default=5000)
+    parser.add_argument("--max-cost-growth", type=float, default=1.5, help="allowed ratio of update cost, last/first")
+    args = parser.parse_args()
+    if args.sample_every % 1000:
+        parser.error("--sample-every must be a multiple of 1000")
+
+    from game import Game
+    pygame.init()
+    screen = pygame.display.set_mode((800, 400))
+    game = Game(screen)
+    game.invincible = args.invincible
+    game.ghost_folder = None  # soak deaths must not write ghost files
+    game.reset("soak")
+    game.state = "playing"
+
+    if args.tracemalloc:
+        tracemalloc.start(1)
+        baseline = tracemalloc.take_snapshot()
+
+    samples = []
+    block_costs = []
+    deaths = 0
+    block_start = time.perf_counter()
+    started = time.time()
+
+    for tick in range(1, args.ticks + 1):
+        bot_step(game)
+        game.update()
+        if args.draw:
+            game.draw()
+        if game.state != "playing":
+            deaths += 1
+            game.reset("soak")
+            game.state = "playing"
+
+        if tick % 1000 == 0:
+            now = time.perf_counter()
+            block_costs.append((now - block_start) * 1000.0)
+            block_start = now
+
+        if tick % args.sample_every == 0:
+            gc.collect()
+            sample = {
+                "tick": tick,
+                "rss_mb": rss_mb(),
+                "traced_mb": tracemalloc.get_traced_memory()[0] / (1024 * 1024) if args.tracemalloc else 0.0,
+                "objects": len(gc.get_objects()),
+                "cost_ms": statistics.mean(block_costs),
+            }
+            block_costs = []
+            samples.append(sample)
+            print(f"tick={tick:>9} score={game.score:>7} level={game.game_level:>5} deaths={deaths:>4} "
+                  f"rss={sample['rss_mb']:7.1f}MB traced={sample['traced_mb']:6.2f}MB "
+                  f"objects={sample['objects']:>7} cost/1000={sample['cost_ms']:7.2f}ms", flush=True)
+            # keep the sampling work itself out of the next block
+            block_start = time.perf_counter()
+
+    print(f"done: {args.ticks} ticks in {time.time() - started:.1f}s, {deaths} deaths")
+
+    if args.tracemalloc:
+        print(f"top {args.top} allocators (growth since start):")
+        for stat in tracemalloc.take_snapshot().compare_to(baseline, "lineno")[:args.top]:
+            print("  ", stat)
+        tracemalloc.stop()
+
+    failures = []
+    checked = samples[int(len(samples) * args.warmup):]
+    if len(checked) < 3:
+        print("not enough samples for growth detection (raise --ticks or lower --sample-every)")
+    else:
+        limits = [
+            ("rss_mb", args.max_rss_growth_mb, "RSS grew {:.1f} -> {:.1f} MB"),
+            ("traced_mb", args.max_traced_growth_mb, "traced memory grew {:.2f} -> {:.2f} MB"),
+            ("objects", args.max_object_growth, "object count grew {:.0f} -> {:.0f}"),
+        ]
+        for key, limit, message in limits:
+            first, last = growth([s[key] for s in checked])
+            if last - first > limit:
+                failures.append(message.format(first, last))
+        first, last = growth([s["cost_ms"] for s in checked])
+        if first > 0 and last / first > args.max_cost_growth:
+            failures.append(f"update cost grew {first:.2f} -> {last:.2f} ms per 1000 ticks")
+
+    pygame.quit()
+    for f in failures:
+        print("FAIL:", f)
+    if failures:
+        return 1
+    print("PASS: no sustained growth")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Gameplay telemetry: structured events -> ring buffer -> rotated .jsonl.gz files.
+
+The game calls Telemetry.emit() (cheap: one dict and a deque append). A
+background thread drains the ring buffer in batches and appends each batch
+as a gzip member to the current file, rotating once it passes max_file_bytes
+and keeping at most max_files files.
+
+Offline report (streams the files line by line):
+
+    python telemetry.py report [folder]
+"""
+import os, sys, time, json, gzip, uuid, argparse, threading
+from collections import deque, defaultdict
+
+class Telemetry:
+    def __init__(self, folder="telemetry", capacity=10000, batch_size=256, flush_interval=2.0,
+                 max_file_bytes=1024 * 1024, max_files=50, summary_every=600):
+        self.folder = folder
+        self.buffer = deque(maxlen=capacity)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+
+        self.session = uuid.uuid4().hex[:12]
+        self.run = 0
+        self.dropped = 0  # events overwritten because the writer fell behind
+        self._file_index = 0
+
+        # frame-time summary accumulator (see frame())
+        self.summary_every = summary_every
+        self._frames = 0
+        self._frame_sum = 0.0
+        self._frame_max = 0.0
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- producer side ----------
+    def emit(self, event, **fields):
+        if event == "run_start":
+            self.run += 1
+        record = {"t": round(time.time(), 3), "session": self.session, "run": self.run, "event": event}
+        record.update(fields)
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self._wake.set()
+
+    def frame(self, frame_ms, **fields):
+        """Accumulate one frame time; emits a frame_summary every summary_every frames"""
+        self._frames += 1
+        self._frame_sum += frame_ms
+        if frame_ms > self._frame_max:
+            self._frame_max = frame_ms
+        if self._frames >= self.summary_every:
+            self.emit("frame_summary", frames=self._frames, avg_ms=round(self._frame_sum / self._frames, 3),
+                      max_ms=round(self._frame_max, 3), **fields)
+            self._frames = 0
+            self._frame_sum = 0.0
+            self._frame_max = 0.0
+
+    # ---------- writer side ----------
+    def start(self):
+        if self._thread is None:
+            os.makedirs(self.folder, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Stop the writer thread and flush whatever is still buffered"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        if self.dropped:
+            self.emit("dropped", count=self.dropped)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print("Telemetry write error:", e)
+
+    def flush(self):
+        while self.buffer:
+            batch = []
+            while self.buffer and len(batch) < self.batch_size:
+                batch.append(self.buffer.popleft())
+            self._write_batch(batch)
+
+    def current_path(self):
+        return os.path.join(self.folder, f"events-{self.session}-{self._file_index:04d}.jsonl.gz")
+
+    def _write_batch(self, batch):
+        os.makedirs(self.folder, exist_ok=True)
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in batch).encode("utf-8")
+        path = self.current_path()
+        # every batch becomes its own gzip member; gzip readers treat them as one stream
+        with gzip.open(path, "ab") as f:
+            f.write(data)
+        if os.path.getsize(path) >= self.max_file_bytes:
+            self._file_index += 1
+            self._prune()
+
+    def _prune(self):
+        files = sorted(iter_event_files(self.folder), key=os.path.getmtime)
+        for path in files[:max(0, len(files) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+# ---------- offline aggregation ----------
+def iter_event_files(folder):
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, fn) for fn in sorted(os.listdir(folder))
+            if fn.startswith("events-") and fn.endswith(".jsonl.gz")]
+
+def iter_events(paths):
+    """Stream events from telemetry files without loading them fully"""
+    for path in paths:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # truncated last line of a file that was being written
+        except (OSError, EOFError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+
+def aggregate_deaths(events):
+    """Per-level death rate: deaths at level L / runs that reached level L.
+
+    Only runs still in progress are kept in memory; a run is settled as soon
+    as its collision event arrives.
+    """
+    reached = defaultdict(int)
+    deaths = defaultdict(int)
+    killers = defaultdict(lambda: defaultdict(int))
+    open_runs = {}  # (session, run) -> highest level seen
+
+    def settle(level):
+        for lvl in range(1, level + 1):
+            reached[lvl] += 1
+
+    for ev in events:
+        key = (ev.get("session"), ev.get("run"))
+        kind = ev.get("event")
+        if kind == "run_start":
+            if key in open_runs:
+                settle(open_runs[key])
+            open_runs[key] = 1
+        elif kind == "level_up":
+            open_runs[key] = max(open_runs.get(key, 1), ev.get("level", 1))
+        elif kind == "collision":
+            level = max(open_runs.pop(key, 1), ev.get("level", 1))
+            settle(level)
+            deaths[level] += 1
+            killers[level][ev.get("obstacle_type", "unknown")] += 1
+
+    # runs that ended without a death (quit, pause and never resumed)
+    for level in open_runs.values():
+        settle(level)
+
+    rows = []
+    for lvl in sorted(reached):
+        rows.append({
+            "level": lvl,
+            "runs": reached[lvl],
+            "deaths": deaths[lvl],
+            "death_rate": deaths[lvl] / reached[lvl],
+            "killers": dict(killers[lvl]),
+        })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Super Maro telemetry tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="per-level death rates")
+    report.add_argument("folder", nargs="?", default="telemetry")
+    report.add_argument("--json", action="store_true", help="print rows as JSON lines")
+    args = parser.parse_args(argv)
+
+    rows = aggregate_deaths(iter_events(iter_event_files(args.folder)))
+    if not rows:
+        print(f"No telemetry found in {args.folder}")
+        return 1
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+        return 0
+
+    print(f"{'Level':>5} {'Runs':>7} {'Deaths':>7} {'Rate':>7}  Killers")
+    for row in rows:
+        killers = ", ".join(f"{k}={v}" for k, v in sorted(row["killers"].items()))
+        print(f"{row['level']:>5} {row['runs']:>7} {row['deaths']:>7} {row['death_rate']:>6.1%}  {killers}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
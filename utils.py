@@ -1,9 +1,16 @@
 import pygame, os
 
+def convert_for_display(surf, alpha=True):
+    # convert() needs a display surface; the texture backend has none and
+    # uploads the loaded surface as it is
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
 def load_image_safe(path, fallback_size=(100, 100), color=(150,150,150)):
     try:
         surf = pygame.image.load(path)
-        return surf.convert_alpha() if surf.get_alpha() else surf.convert()
+        return convert_for_display(surf, bool(surf.get_alpha()))
     except:
         surf = pygame.Surface(fallback_size, pygame.SRCALPHA)
         surf.fill(color)